@@ -1,16 +1,48 @@
+import gzip
 import json
+import os
 
 try:
-    with open('./public/data/transit_graph.json', 'r') as f:
-        graph = json.load(f)
-        
-    print(f"Total Nodes: {len(graph)}")
-    
-    # Get first node
-    first_node = list(graph.keys())[0]
-    print(f"Sample Node ({first_node}):")
-    print(json.dumps(graph[first_node], indent=2))
-    
+    import ijson
+except ImportError:
+    ijson = None  # Fall back to loading the whole file
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to stdlib json
+
+GRAPH_PATH = './public/data/transit_graph.json'
+
+def open_graph():
+    """Opens the graph file, preferring the gzip sibling if present."""
+    if os.path.exists(GRAPH_PATH + '.gz'):
+        return gzip.open(GRAPH_PATH + '.gz', 'rb')
+    return open(GRAPH_PATH, 'rb')
+
+try:
+    first = None
+    total = 0
+
+    if ijson is not None:
+        # Stream top-level entries so the multi-MB graph is never fully
+        # materialized just to count nodes and sample one of them.
+        with open_graph() as f:
+            for key, value in ijson.kvitems(f, '', use_float=True):
+                if first is None:
+                    first = (key, value)
+                total += 1
+    else:
+        with open_graph() as f:
+            graph = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        total = len(graph)
+        first_key = next(iter(graph))
+        first = (first_key, graph[first_key])
+
+    print(f"Total Nodes: {total}")
+    print(f"Sample Node ({first[0]}):")
+    print(json.dumps(first[1], indent=2))
+
     print("STATUS: GRAPH VALID")
 except Exception as e:
-    print(f"STATUS: FAILED - {e}")
\ No newline at end of file
+    print(f"STATUS: FAILED - {e}")
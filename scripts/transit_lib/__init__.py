@@ -0,0 +1,22 @@
+"""Shared library for the transit graph build scripts."""
+from .config import (API_KEY, BASE_URL, OUTPUT_DIR,
+                     AVG_BUS_SPEED_KMH, MRT_SPEED_KMH, LRT_SPEED_KMH,
+                     WALK_SPEED_KMH, SECONDS_PER_HOUR, MAX_WALK_RADIUS_KM)
+from .fetch import fetch_lta_data, load_local_json, save_json
+from .geo import (haversine_distance, candidate_distances,
+                  calculate_time_weight, calculate_time_weights, get_grid_key)
+from .graph import (make_graph, add_edge, finalize_graph, project_route,
+                    build_bus_graph, build_rail_graph, metadata_arrays,
+                    generate_walking_edges, graph_to_csr)
+
+__all__ = [
+    'API_KEY', 'BASE_URL', 'OUTPUT_DIR',
+    'AVG_BUS_SPEED_KMH', 'MRT_SPEED_KMH', 'LRT_SPEED_KMH',
+    'WALK_SPEED_KMH', 'SECONDS_PER_HOUR', 'MAX_WALK_RADIUS_KM',
+    'fetch_lta_data', 'load_local_json', 'save_json',
+    'haversine_distance', 'candidate_distances',
+    'calculate_time_weight', 'calculate_time_weights', 'get_grid_key',
+    'make_graph', 'add_edge', 'finalize_graph', 'project_route',
+    'build_bus_graph', 'build_rail_graph', 'metadata_arrays',
+    'generate_walking_edges', 'graph_to_csr',
+]
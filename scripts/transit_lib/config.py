@@ -0,0 +1,22 @@
+"""Shared configuration for the transit graph build scripts."""
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+API_KEY = os.getenv('LTA_DATAMALL_API_KEY')
+BASE_URL = 'https://datamall2.mytransport.sg/ltaodataservice'
+OUTPUT_DIR = './public/data'
+
+# --- PHYSICS CONSTANTS ---
+AVG_BUS_SPEED_KMH = 25
+MRT_SPEED_KMH = 60
+LRT_SPEED_KMH = 40
+WALK_SPEED_KMH = 5
+SECONDS_PER_HOUR = 3600
+MAX_WALK_RADIUS_KM = 0.4 # Max transfer distance (400m)
+
+PAGE_SIZE = 500
+FETCH_WORKERS = 8
@@ -0,0 +1,98 @@
+"""LTA DataMall fetching and JSON file I/O."""
+import gzip
+import json
+import os
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import API_KEY, BASE_URL, OUTPUT_DIR, PAGE_SIZE, FETCH_WORKERS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to stdlib json
+
+headers = {
+    'AccountKey': API_KEY,
+    'accept': 'application/json'
+}
+
+# Shared session: keep-alive avoids a fresh TCP+TLS handshake per page,
+# with one pooled connection per fetch worker
+_SESSION = requests.Session()
+_SESSION.headers.update(headers)
+_SESSION.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=FETCH_WORKERS, pool_maxsize=FETCH_WORKERS))
+
+def _fetch_page(endpoint, skip, project=None):
+    url = f"{BASE_URL}/{endpoint}?$skip={skip}"
+    try:
+        response = _SESSION.get(url)
+        if response.status_code != 200:
+            print(f"Error {response.status_code}: {response.text}")
+            return None
+        results = response.json().get('value', [])
+        if project is not None:
+            return [project(row) for row in results]
+        return results
+    except Exception as e:
+        print(f"Request failed: {e}")
+        return None
+
+def fetch_lta_data(endpoint, project=None):
+    """Fetches data from LTA API with pagination, requesting pages concurrently.
+
+    `project` maps each raw row to a leaner record (e.g. a tuple) as pages
+    arrive, so the full dict-per-row response is never held in memory.
+    """
+    data_buffer = []
+    skip = 0
+    print(f"Fetching {endpoint}...")
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        while True:
+            # Issue a batch of skips in parallel; the API pages
+            # deterministically until it returns an empty list.
+            skips = range(skip, skip + FETCH_WORKERS * PAGE_SIZE, PAGE_SIZE)
+            pages = pool.map(lambda s: _fetch_page(endpoint, s, project), skips)
+
+            exhausted = False
+            for page in pages:
+                if not page:
+                    exhausted = True
+                    break
+                data_buffer.extend(page)
+            if exhausted: break
+
+            skip += FETCH_WORKERS * PAGE_SIZE
+
+    print(f"Fetched {len(data_buffer)} records for {endpoint}")
+    return data_buffer
+
+def load_local_json(filename):
+    """Loads local JSON files (MRT/LRT data)."""
+    path = os.path.join(OUTPUT_DIR, filename)
+    if not os.path.exists(path):
+        print(f"Warning: {path} not found. Skipping.")
+        return []
+    with open(path, 'rb') as f:
+        if orjson is not None:
+            return orjson.loads(f.read())
+        return json.load(f)
+
+def save_json(path, obj, compress=True):
+    """Writes JSON output, using orjson when available for speed.
+
+    With `compress`, also writes a gzip sibling (path + '.gz') for
+    hosts that serve precompressed assets; the repetitive edge records
+    shrink ~85%. The plain file stays for consumers fetching raw JSON.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(obj)
+    else:
+        payload = json.dumps(obj).encode('utf-8')
+
+    with open(path, 'wb') as f:
+        f.write(payload)
+    if compress:
+        with gzip.open(path + '.gz', 'wb', compresslevel=6) as f:
+            f.write(payload)
@@ -0,0 +1,63 @@
+"""Geospatial helpers: haversine kernels, time weights, grid keys."""
+import math
+import numpy as np
+
+from .config import SECONDS_PER_HOUR
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Run the pure-Python/NumPy paths
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    R = 6371
+    lat1_r = math.radians(lat1)
+    lat2_r = math.radians(lat2)
+    sin_dlat = math.sin((lat2_r - lat1_r) / 2)
+    sin_dlon = math.sin(math.radians(lon2 - lon1) / 2)
+    a = sin_dlat * sin_dlat + \
+        math.cos(lat1_r) * math.cos(lat2_r) * \
+        sin_dlon * sin_dlon
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+def candidate_distances(lat, lng, lats, lngs, idx):
+    """Haversine distances from one point to metadata[idx] candidates."""
+    dlat = np.radians(lats[idx] - lat)
+    dlon = np.radians(lngs[idx] - lng)
+    a = np.sin(dlat / 2) ** 2 + \
+        math.cos(math.radians(lat)) * np.cos(np.radians(lats[idx])) * \
+        np.sin(dlon / 2) ** 2
+    return 2 * 6371 * np.arcsin(np.sqrt(a))
+
+if njit is not None:
+    # Compile the scalar haversine and the walking-edge pair scan to
+    # machine code; the loop form avoids the temporaries of the NumPy path.
+    haversine_distance = njit(cache=True, fastmath=True)(haversine_distance)
+
+    @njit(cache=True, fastmath=True)
+    def candidate_distances(lat, lng, lats, lngs, idx):
+        out = np.empty(idx.shape[0])
+        lat_r = math.radians(lat)
+        cos_lat = math.cos(lat_r)
+        for i in range(idx.shape[0]):
+            j = idx[i]
+            dlat = math.radians(lats[j] - lat)
+            dlon = math.radians(lngs[j] - lng)
+            a = math.sin(dlat / 2) ** 2 + \
+                cos_lat * math.cos(math.radians(lats[j])) * \
+                math.sin(dlon / 2) ** 2
+            out[i] = 2 * 6371 * math.asin(math.sqrt(a))
+        return out
+
+def calculate_time_weight(distance_km, speed_kmh):
+    if distance_km <= 0: return 15
+    return (distance_km / speed_kmh) * SECONDS_PER_HOUR
+
+def calculate_time_weights(dist_km, speed_kmh):
+    """Vectorized calculate_time_weight over a distance array."""
+    weights = dist_km / speed_kmh * SECONDS_PER_HOUR
+    return np.where(dist_km <= 0, 15, weights).astype(np.int64)
+
+def get_grid_key(lat, lng, grid_size=0.005):
+    return (math.floor(lat / grid_size), math.floor(lng / grid_size))
@@ -0,0 +1,221 @@
+"""Graph construction: bus/rail layers, walking edges, CSR export."""
+import re
+import numpy as np
+from collections import defaultdict
+
+from .config import (AVG_BUS_SPEED_KMH, WALK_SPEED_KMH, MAX_WALK_RADIUS_KM)
+from .geo import (haversine_distance, candidate_distances,
+                  calculate_time_weight, calculate_time_weights, get_grid_key)
+
+try:
+    from sklearn.neighbors import BallTree
+except ImportError:
+    BallTree = None  # Fall back to the grid-based neighbor scan
+
+def make_graph():
+    return defaultdict(lambda: defaultdict(dict))
+
+def add_edge(graph, u, v, service, direction, dist, weight):
+    # Keyed by (service, direction) so repeated trips of the same route
+    # over the same stop pair don't accumulate duplicate edges
+    graph[u][v][(service, direction)] = {
+        'service': service,
+        'direction': direction,
+        'distance': dist,
+        'weight': int(weight)
+    }
+
+def finalize_graph(graph):
+    """Converts the keyed edge dicts back to the serialized list form."""
+    return {u: {v: list(edges.values()) for v, edges in targets.items()}
+            for u, targets in graph.items()}
+
+# Field positions in the projected route tuples
+R_SVC, R_DIR, R_SEQ, R_STOP, R_DIST = range(5)
+
+def project_route(row):
+    """Projects a raw BusRoutes row to a compact tuple."""
+    return (row['ServiceNo'], row['Direction'], row['StopSequence'],
+            row['BusStopCode'], float(row.get('Distance') or 0))
+
+def build_bus_graph(routes_data, graph):
+    print("Building Bus Layer...")
+
+    # Columnar layout: integer-encode services, lexsort in C, then derive
+    # segment distances and the route-continuity mask as whole columns
+    svc_codes = np.unique([r[R_SVC] for r in routes_data], return_inverse=True)[1]
+    dirn = np.array([r[R_DIR] for r in routes_data])
+    seq = np.array([r[R_SEQ] for r in routes_data])
+    dist = np.array([r[R_DIST] for r in routes_data])
+
+    order = np.lexsort((seq, dirn, svc_codes))
+    svc_codes, dirn, seq, dist = svc_codes[order], dirn[order], seq[order], dist[order]
+    services = [routes_data[i][R_SVC] for i in order]
+    stops = [routes_data[i][R_STOP] for i in order]
+
+    seg_dist = np.maximum(np.diff(dist), 0)
+    weights = calculate_time_weights(seg_dist, AVG_BUS_SPEED_KMH)
+    cont = (svc_codes[:-1] == svc_codes[1:]) & \
+           (dirn[:-1] == dirn[1:]) & \
+           (seq[1:] == seq[:-1] + 1)
+
+    for k in np.nonzero(cont)[0]:
+        add_edge(graph, stops[k], stops[k + 1],
+                 services[k], int(dirn[k]), float(seg_dist[k]), weights[k])
+
+# Station codes look like "NS1" / "EW24"; the number orders stops on a line
+_CODE_NUM_RE = re.compile(r'\d+')
+
+def build_rail_graph(stations_data, graph, metadata, speed_kmh, mode_type):
+    print(f"Building {mode_type} Layer...")
+
+    lines = {}
+    for stn in stations_data:
+        line = stn.get('line', 'UNKNOWN')
+        if line not in lines: lines[line] = []
+        lines[line].append(stn)
+
+        # Parse code/coords once per station instead of per comparison
+        match = _CODE_NUM_RE.search(stn['code'])
+        stn['_idx'] = int(match.group()) if match else 0
+        stn['_lat'] = float(stn['lat'])
+        stn['_lng'] = float(stn['lng'])
+
+    # Add to metadata with TYPE
+    metadata.update({
+        stn['code']: {
+            'lat': stn['_lat'],
+            'lng': stn['_lng'],
+            'name': stn['name'] + f" {mode_type}", # Append type for clarity in search
+            'road': f"{stn.get('line', 'UNKNOWN')} Line",
+            'type': mode_type # Tag for UI icons
+        }
+        for stn in stations_data
+    })
+
+    for line_name, stations in lines.items():
+        stations.sort(key=lambda s: s['_idx'])
+
+        for i in range(len(stations) - 1):
+            u, v = stations[i], stations[i+1]
+            dist = haversine_distance(u['_lat'], u['_lng'], v['_lat'], v['_lng'])
+            weight = calculate_time_weight(dist, speed_kmh)
+
+            add_edge(graph, u['code'], v['code'], line_name, 1, dist, weight)
+            add_edge(graph, v['code'], u['code'], line_name, 2, dist, weight)
+
+def metadata_arrays(metadata):
+    """Unpacks metadata into parallel code/lat/lng arrays (SoA layout).
+
+    Bulk geometry code indexes these arrays by position instead of doing
+    string-keyed dict lookups per node.
+    """
+    codes = list(metadata.keys())
+    lats = np.array([metadata[code]['lat'] for code in codes])
+    lngs = np.array([metadata[code]['lng'] for code in codes])
+    return codes, lats, lngs
+
+def generate_walking_edges(metadata, graph):
+    print("Generating Walking & Transfer Edges...")
+    codes, lats, lngs = metadata_arrays(metadata)
+
+    if BallTree is not None:
+        # Proper radius query: O(N log N) instead of scanning every
+        # candidate in a 3x3 grid neighborhood.
+        coords = np.radians(np.column_stack((lats, lngs)))
+        tree = BallTree(coords, metric='haversine')
+        neighbors, dist_rads = tree.query_radius(
+            coords, r=MAX_WALK_RADIUS_KM / 6371.0, return_distance=True)
+
+        count = 0
+        for i, (neigh, d_rads) in enumerate(zip(neighbors, dist_rads)):
+            code = codes[i]
+            # One vectorized pass per source instead of a scalar
+            # division and int-cast per neighbor
+            dists = d_rads * 6371.0
+            weights = calculate_time_weights(dists, WALK_SPEED_KMH)
+            for j, dist, weight in zip(neigh, dists, weights):
+                if i == j: continue
+
+                add_edge(graph, code, codes[j], 'WALK', 0, float(dist), weight)
+                count += 1
+
+        print(f"Generated {count} walking connections.")
+        return
+
+    _generate_walking_edges_grid(graph, codes, lats, lngs)
+
+def _generate_walking_edges_grid(graph, codes, lats, lngs):
+    """Grid-based fallback neighbor scan, used when sklearn is missing."""
+    grid = {}
+    grid_size = 0.005
+
+    for i in range(len(codes)):
+        key = get_grid_key(lats[i], lngs[i], grid_size)
+        if key not in grid: grid[key] = []
+        grid[key].append(i)
+
+    count = 0
+    for i, code in enumerate(codes):
+        lat, lng = lats[i], lngs[i]
+        center_key = get_grid_key(lat, lng, grid_size)
+
+        candidates = []
+        for x in [-1, 0, 1]:
+            for y in [-1, 0, 1]:
+                k = (center_key[0] + x, center_key[1] + y)
+                if k in grid: candidates.extend(grid[k])
+
+        # Bulk haversine over all candidates in the 3x3 neighborhood
+        idx = np.array(candidates)
+        dists = candidate_distances(lat, lng, lats, lngs, idx)
+
+        mask = dists <= MAX_WALK_RADIUS_KM
+        near = dists[mask]
+        weights = calculate_time_weights(near, WALK_SPEED_KMH)
+        for target_idx, dist, weight in zip(idx[mask], near, weights):
+            if target_idx == i: continue
+
+            add_edge(graph, code, codes[target_idx], 'WALK', 0, float(dist), weight)
+            count += 1
+
+    print(f"Generated {count} walking connections.")
+
+def graph_to_csr(graph):
+    """Flattens the nested adjacency dict into CSR-style parallel arrays.
+
+    Neighbors of node i live in col_idx[row_ptr[i]:row_ptr[i+1]], with
+    edge attributes in the matching slices of the edge_* arrays.
+    """
+    codes = set(graph)
+    for targets in graph.values():
+        codes.update(targets)
+    codes = sorted(codes)
+    node_ids = {code: i for i, code in enumerate(codes)}
+
+    row_ptr = [0]
+    col_idx = []
+    edge_service = []
+    edge_direction = []
+    edge_distance = []
+    edge_weight = []
+
+    for code in codes:
+        for target, edges in graph.get(code, {}).items():
+            for edge in edges:
+                col_idx.append(node_ids[target])
+                edge_service.append(edge['service'])
+                edge_direction.append(edge['direction'])
+                edge_distance.append(edge['distance'])
+                edge_weight.append(edge['weight'])
+        row_ptr.append(len(col_idx))
+
+    return {
+        'node_ids': node_ids,
+        'row_ptr': row_ptr,
+        'col_idx': col_idx,
+        'edge_service': edge_service,
+        'edge_direction': edge_direction,
+        'edge_distance': edge_distance,
+        'edge_weight': edge_weight
+    }